@@ -50,6 +50,13 @@ collection and vice versa. This allows to use standard higher-order functions
 >>> unflatten(flatten(obj))
 {'a': [{'b': 10}, {'b': 20}]}
 ```
+
+The same update can also be done in a single pass.
+
+```python
+>>> update_matching(obj, [("a", ..., "b")], lambda value: value * 10)
+{'a': [{'b': 100}, {'b': 200}]}
+```
 """
 
 __author__ = "Javier Escalada Gómez"
@@ -58,7 +65,8 @@ __version__ = "0.1.0"
 __license__ = "BSD 3-Clause Clear License"
 
 from collections.abc import Mapping, Iterable
-from collections import deque
+from functools import lru_cache
+from sys import intern
 
 AUTOPARSE = True
 SEP_CHR = "."
@@ -66,6 +74,37 @@ WILDCARD_OBJ = ...
 
 _undefined = object()
 
+# Replaces the wildcard objects in the patterns prepared by compile_patterns
+_wildcard = object()
+
+# Whether each type seen by _check_path is a valid path
+_PATH_TYPES = {tuple: True, list: True, str: False}
+
+# Shared empty containers returned by flatten_into. They must not be modified
+_EMPTY_DICT = {}
+_EMPTY_LIST = []
+
+# Pattern sets larger than this are matched with a trie in compile_patterns
+_TRIE_THRESHOLD = 24
+
+# Matchers of the patterns given to match and fullmatch. A pattern set is
+# compiled the second time it is seen, until then it maps to None
+_MATCHERS = {}
+_MATCHERS_SIZE = 1024
+
+# Kind of node of each type seen by flatten, to avoid checking the ABCs again
+_LEAF, _MAPPING, _SEQUENCE = range(3)
+_KINDS = {
+    dict: _MAPPING,
+    list: _SEQUENCE,
+    tuple: _SEQUENCE,
+    str: _LEAF,
+    int: _LEAF,
+    float: _LEAF,
+    bool: _LEAF,
+    type(None): _LEAF,
+}
+
 
 def get(obj, path, default=_undefined, autoparse=AUTOPARSE, **parse_args):
     """Get a value from a nested collection using the `path`.
@@ -95,6 +134,15 @@ def get(obj, path, default=_undefined, autoparse=AUTOPARSE, **parse_args):
     'default'
     ```
 
+    The `default` value does not hide an invalid `path`.
+
+    ```python
+    >>> get(obj, 5, "default")
+    Traceback (most recent call last):
+        ...
+    TypeError: path must be an iterable of keys or indexes
+    ```
+
     If the given `path` is a string and `autoparse` is `True`, it is first
     converted using the [data_tools.parse] function. Any additional keyword
     arguments are passed to the [data_tools.parse] function.
@@ -106,13 +154,65 @@ def get(obj, path, default=_undefined, autoparse=AUTOPARSE, **parse_args):
     """
     if not path:
         return obj
-    path = _try_parse(path, autoparse, "path", **parse_args)
-    try:
+    if isinstance(path, str):
+        path = _try_parse(path, autoparse, "path", **parse_args)
+    _check_path(path)
+    if default is _undefined:
         return _traverse(obj, path)
-    except (KeyError, IndexError) as e:
+    return _traverse_or(obj, path, default)
+
+
+def get_many(obj, paths, default=_undefined, autoparse=AUTOPARSE, **parse_args):
+    """Get several values from a nested collection at once.
+
+    This is equivalent to calling [data_tools.get] for each path, but the
+    `default` and the parsing arguments are only given once.
+
+    ```python
+    >>> obj = {"a": [{"b": {"c": 10}}, {"b": {"c": 100}}]}
+    >>> get_many(obj, [("a", 0, "b", "c"), ("a", 1, "b", "c")])
+    [10, 100]
+    >>> get_many(obj, [("a", 0, "b", "c"), ("a", 2, "b", "c")])
+    Traceback (most recent call last):
+        ...
+    IndexError: list index out of range
+    ```
+
+    The `default` value is returned for each path that does not exist.
+
+    ```python
+    >>> get_many(obj, [("a", 0, "b", "c"), ("a", 2, "b", "c")], "default")
+    [10, 'default']
+    ```
+
+    As in [data_tools.get], an empty `path` returns the whole object.
+
+    ```python
+    >>> get_many({"a": 1}, [(), ("a",)])
+    [{'a': 1}, 1]
+    ```
+
+    String paths are converted using the [data_tools.parse] function, the same
+    way as in [data_tools.get].
+
+    ```python
+    >>> get_many(obj, ["a/0/b/c", "a/1/b/c"], sep_chr="/")
+    [10, 100]
+    ```
+    """
+    result = []
+    for path in paths:
+        if not path:
+            result.append(obj)
+            continue
+        if isinstance(path, str):
+            path = _try_parse(path, autoparse, "path", **parse_args)
+        _check_path(path)
         if default is _undefined:
-            raise e
-        return default
+            result.append(_traverse(obj, path))
+        else:
+            result.append(_traverse_or(obj, path, default))
+    return result
 
 
 def set(obj, path, value, autoparse=AUTOPARSE, **parse_args):
@@ -158,16 +258,40 @@ def set(obj, path, value, autoparse=AUTOPARSE, **parse_args):
     """
     if not path:
         raise ValueError("path must not be empty")
-    path = _try_parse(path, autoparse, "path", **parse_args)
-    cur = _traverse(obj, path[:-1])
+    if isinstance(path, str):
+        path = _try_parse(path, autoparse, "path", **parse_args)
+    _set_raw(obj, path, value)
+    return obj
+
+
+def _set_raw(obj, path, value):
+    cur = obj
+    for key in path[:-1]:
+        cur = cur[key]
+    key = path[-1]
+    # Plain dicts and appends to plain lists do not need _set_item
+    if type(cur) is dict:
+        cur[key] = value
+    elif type(cur) is list and isinstance(key, int) and key == len(cur):
+        cur.append(value)
+    else:
+        _set_item(cur, key, value)
+
+
+def _set_item(cur, key, value):
+    if isinstance(cur, list):
+        if isinstance(key, int) and key == len(cur):
+            cur.append(value)
+        else:
+            cur[key] = value
+        return
     try:
-        cur[path[-1]] = value
+        cur[key] = value
     except IndexError as e:
-        if path[-1] == len(cur):
+        if isinstance(key, int) and key == len(cur):
             cur.append(value)
         else:
             raise e
-    return obj
 
 
 def delete(obj, path, autoparse=AUTOPARSE, **parse_args):
@@ -205,14 +329,12 @@ def delete(obj, path, autoparse=AUTOPARSE, **parse_args):
     """
     if not path:
         raise ValueError("path must not be empty")
-    path = _try_parse(path, autoparse, "path", **parse_args)
-    cur = _traverse(obj, path[:-1])
-    try:
-        del cur[path[-1]]
-    except KeyError as e:
-        raise e
-    except IndexError as e:
-        raise e
+    if isinstance(path, str):
+        path = _try_parse(path, autoparse, "path", **parse_args)
+    cur = obj
+    for key in path[:-1]:
+        cur = cur[key]
+    del cur[path[-1]]
     return obj
 
 
@@ -259,26 +381,127 @@ def update(obj, path, func, autoparse=AUTOPARSE, **parse_args):
     """
     if not path:
         raise ValueError("path must not be empty")
-    path = _try_parse(path, autoparse, "path", **parse_args)
-    cur = _traverse(obj, path[:-1])
+    if isinstance(path, str):
+        path = _try_parse(path, autoparse, "path", **parse_args)
+    cur = obj
+    for key in path[:-1]:
+        cur = cur[key]
+    cur[path[-1]] = func(cur[path[-1]])
+    return obj
+
+
+def update_matching(obj, patterns, func, wildcard_obj=WILDCARD_OBJ, autoparse=AUTOPARSE, **parse_args):
+    """Update all the leaves whose path matches any of the `patterns`.
+
+    This is the same as updating each path returned by [data_tools.flatten]
+    that passes [data_tools.fullmatch], but it is done in a single traversal
+    that skips the subtrees that can not match.
+
+    ```python
+    >>> obj = {"a": [{"b": 1}, {"b": 2}], "c": [{"b": 3}]}
+    >>> update_matching(obj, [("a", ..., "b")], lambda x: x * 10)
+    {'a': [{'b': 10}, {'b': 20}], 'c': [{'b': 3}]}
+    >>> update_matching(obj, [(..., ..., "b")], lambda x: x + 1)
+    {'a': [{'b': 11}, {'b': 21}], 'c': [{'b': 4}]}
+    ```
+
+    Only the leaves are updated, even if a non-leaf node matches.
+
+    ```python
+    >>> update_matching(obj, [("a", ...)], lambda x: None)
+    {'a': [{'b': 11}, {'b': 21}], 'c': [{'b': 4}]}
+    ```
+
+    This function returns the updated object.
+
+    The `wildcard_obj`, `autoparse` and `parse_args` arguments have the same
+    meaning as in [data_tools.fullmatch].
+
+    ```python
+    >>> update_matching(obj, ["a/?/b", "c/0/b"], lambda x: 0, sep_chr="/", wildcard_chr="?")
+    {'a': [{'b': 0}, {'b': 0}], 'c': [{'b': 0}]}
+    ```
+    """
+    parse_args = {"wildcard_obj": wildcard_obj, **parse_args}
+    parsed = []
+    for pattern in patterns:
+        if isinstance(pattern, str):
+            pattern = _try_parse(pattern, autoparse, "pattern", **parse_args)
+        parsed.append(tuple(pattern))
     try:
-        cur[path[-1]] = func(cur[path[-1]])
-    except (KeyError, IndexError) as e:
-        raise e
+        root = _build_trie(parsed, wildcard_obj)
+    except TypeError:
+        # Unhashable keys can not be trie edges
+        matcher = compile_patterns(*parsed, full=True, wildcard_obj=wildcard_obj)
+        for path, value in list(flatten(obj, only_leaves=True)):
+            if matcher(path):
+                update(obj, path, func)
+        return obj
+
+    # Each container is visited along with the trie nodes reached by its path
+    stack = [(obj, [root])]
+    while stack:
+        cur, nodes = stack.pop()
+        t = type(cur)
+        kind = _KINDS.get(t)
+        if kind is None:
+            kind = _kind(t)
+        if kind is _LEAF:
+            continue
+        for key, value in cur.items() if kind is _MAPPING else enumerate(cur):
+            children = _trie_step(nodes, key)
+            if not children:
+                continue
+            t = type(value)
+            kind = _KINDS.get(t)
+            if kind is None:
+                kind = _kind(t)
+            if kind is not _LEAF:
+                stack.append((value, children))
+                continue
+            for node in children:
+                if node[2]:
+                    cur[key] = func(value)
+                    break
     return obj
 
 
+def _check_path(path):
+    t = type(path)
+    valid = _PATH_TYPES.get(t)
+    if valid is None:
+        valid = _PATH_TYPES[t] = issubclass(t, Iterable) and not issubclass(t, str)
+    if not valid:
+        raise TypeError("path must be an iterable of keys or indexes")
+
+
 def _traverse(obj, path):
-    assert isinstance(path, Iterable) and not isinstance(path, str)
     for key in path:
-        try:
+        obj = obj[key]
+    return obj
+
+
+def _traverse_or(obj, path, default):
+    # Same as _traverse, but plain dicts and lists are probed without raising
+    for key in path:
+        t = type(obj)
+        if t is dict:
+            obj = obj.get(key, _undefined)
+            if obj is _undefined:
+                return default
+        elif t is list and isinstance(key, int):
+            if not -len(obj) <= key < len(obj):
+                return default
             obj = obj[key]
-        except (KeyError, IndexError) as e:
-            raise e
+        else:
+            try:
+                obj = obj[key]
+            except (KeyError, IndexError):
+                return default
     return obj
 
 
-def flatten(obj, only_leaves=False):
+def flatten(obj, only_leaves=False, depth_first=False):
     """Flatten (or [data_tools.unnest]) a nested object.
 
     This function returns all the paths in the tree structure of the object.
@@ -306,24 +529,149 @@ def flatten(obj, only_leaves=False):
     >>> list(flatten({'a': [{'b': 1}, {'b': 2}]}, only_leaves=False))
     [((), {}), (('a',), []), (('a', 0), {}), (('a', 1), {}), (('a', 0, 'b'), 1), (('a', 1, 'b'), 2)]
     ```
+
+    The object is traversed in breadth-first order. Set `depth_first` to
+    `True` to return each subtree right after its root instead.
+    Every node still comes after its parent, so the paths can also be passed
+    to [data_tools.unflatten].
+    This mode only keeps the current path in memory, instead of a whole level,
+    but it is slower. It also iterates over the containers lazily, so the
+    object must not be modified until the iteration ends.
+
+    ```python
+    >>> list(flatten({'a': [{'b': 1}, {'b': 2}]}, depth_first=True))
+    [((), {}), (('a',), []), (('a', 0), {}), (('a', 0, 'b'), 1), (('a', 1), {}), (('a', 1, 'b'), 2)]
+    >>> unflatten(flatten({'a': [{'b': 1}, {'b': 2}]}, depth_first=True))
+    {'a': [{'b': 1}, {'b': 2}]}
+    ```
     """
     if not obj:
         return
-    queue = deque([(obj, [])])
-    while queue:
-        obj, path = queue.popleft()
-        if isinstance(obj, Mapping):
-            if not only_leaves:
-                yield tuple(path), obj.__class__()
-            for key, value in obj.items():
-                queue.append((value, [*path, key]))
-        elif isinstance(obj, Iterable) and not isinstance(obj, str):
+    if depth_first:
+        yield from _flatten_depth_first(obj, only_leaves)
+    else:
+        yield from _flatten_breadth_first(obj, only_leaves, False)
+
+
+def flatten_into(out, obj, only_leaves=True, reuse_sentinels=False):
+    """Same as [data_tools.flatten], but the paths are appended to `out`.
+
+    This allows to reuse the same list for several objects.
+    Unlike [data_tools.flatten], only the leaves are returned by default.
+
+    ```python
+    >>> out = []
+    >>> flatten_into(out, {'a': [{'b': 1}, {'b': 2}]})
+    >>> flatten_into(out, {'c': 3})
+    >>> out
+    [(('a', 0, 'b'), 1), (('a', 1, 'b'), 2), (('c',), 3)]
+    ```
+
+    Set `reuse_sentinels` to `True` to return the same empty `dict` and `list`
+    for all the non-leaf nodes, instead of creating new ones.
+    They are shared, so they must not be modified. In particular, these paths
+    must not be passed to [data_tools.unflatten].
+
+    ```python
+    >>> out = []
+    >>> flatten_into(out, {'a': {}, 'b': {}}, only_leaves=False, reuse_sentinels=True)
+    >>> out
+    [((), {}), (('a',), {}), (('b',), {})]
+    >>> out[1][1] is out[2][1]
+    True
+    ```
+    """
+    if obj:
+        out.extend(_flatten_breadth_first(obj, only_leaves, reuse_sentinels))
+
+
+def _flatten_breadth_first(obj, only_leaves, reuse_sentinels):
+    # One level at a time
+    level = [(obj, ())]
+    while level:
+        children = []
+        for obj, path in level:
+            t = type(obj)
+            kind = _KINDS.get(t)
+            if kind is None:
+                kind = _kind(t)
+            if kind is _MAPPING:
+                if not only_leaves:
+                    if t is dict:
+                        yield path, _EMPTY_DICT if reuse_sentinels else {}
+                    else:
+                        yield path, t()
+                for key, value in obj.items():
+                    children.append((value, path + (key,)))
+            elif kind is _SEQUENCE:
+                if not only_leaves:
+                    if t is list:
+                        yield path, _EMPTY_LIST if reuse_sentinels else []
+                    else:
+                        yield path, t()
+                for i, value in enumerate(obj):
+                    children.append((value, path + (i,)))
+            else:
+                yield path, obj
+        level = children
+
+
+def _flatten_depth_first(obj, only_leaves):
+    # A single path is shared by the whole traversal, along with a stack with
+    # the pending items of each level
+    node = _children(obj)
+    if node is None:
+        yield (), obj
+        return
+    empty, items = node
+    if not only_leaves:
+        yield (), empty
+    path = []
+    stack = [items]
+    while stack:
+        for key, value in stack[-1]:
+            # Leaves are the most common, so they are detected inline
+            t = type(value)
+            kind = _KINDS.get(t)
+            if kind is None:
+                kind = _kind(t)
+            if kind is _LEAF:
+                yield (*path, key), value
+                continue
+            empty, items = _children(value)
             if not only_leaves:
-                yield tuple(path), obj.__class__()
-            for i, value in enumerate(obj):
-                queue.append((value, [*path, i]))
+                yield (*path, key), empty
+            path.append(key)
+            stack.append(items)
+            break
         else:
-            yield tuple(path), obj
+            stack.pop()
+            if path:
+                path.pop()
+
+
+def _children(obj):
+    # Returns the empty container and the items of obj, or None for leaves
+    t = type(obj)
+    kind = _KINDS.get(t)
+    if kind is None:
+        kind = _kind(t)
+    if kind is _MAPPING:
+        return {} if t is dict else t(), iter(obj.items())
+    if kind is _SEQUENCE:
+        return [] if t is list else t(), enumerate(obj)
+    return None
+
+
+def _kind(t):
+    if issubclass(t, Mapping):
+        kind = _MAPPING
+    elif issubclass(t, Iterable) and not issubclass(t, str):
+        kind = _SEQUENCE
+    else:
+        kind = _LEAF
+    _KINDS[t] = kind
+    return kind
 
 
 def unflatten(paths, sort=False):
@@ -373,7 +721,7 @@ def unflatten(paths, sort=False):
         return None
 
     if sort:
-        paths = sorted(paths, key=lambda x: len(x[0]))
+        paths = sorted(paths, key=_path_length)
 
     paths = iter(paths)
     root, base = next(paths)
@@ -383,10 +731,16 @@ def unflatten(paths, sort=False):
     for path, value in paths:
         if len(path) < 1:
             raise ValueError("invalid path")
-        set(obj, path, value)
+        if isinstance(path, str):
+            path = _try_parse(path, AUTOPARSE, "path")
+        _set_raw(obj, path, value)
     return obj
 
 
+def _path_length(item):
+    return len(item[0])
+
+
 def unnest(*args, **parse_args):
     """
     Alias for [data_tools.flatten]
@@ -462,7 +816,7 @@ def match(path, *patterns, wildcard_obj=WILDCARD_OBJ, autoparse=AUTOPARSE, **par
     True
     ```
     """
-    return any(_match(path, pattern, False, wildcard_obj, autoparse, **parse_args) for pattern in patterns)
+    return _match_any(path, patterns, False, wildcard_obj, autoparse, parse_args)
 
 
 def fullmatch(path, *patterns, wildcard_obj=WILDCARD_OBJ, autoparse=AUTOPARSE, **parse_args):
@@ -509,42 +863,230 @@ def fullmatch(path, *patterns, wildcard_obj=WILDCARD_OBJ, autoparse=AUTOPARSE, *
     True
     ```
     """
-    return any(_match(path, pattern, True, wildcard_obj, autoparse, **parse_args) for pattern in patterns)
+    return _match_any(path, patterns, True, wildcard_obj, autoparse, parse_args)
+
+
+def compile_patterns(*patterns, full=False, wildcard_obj=WILDCARD_OBJ, autoparse=AUTOPARSE, **parse_args):
+    """Compile the `patterns` into a function that checks a path against them.
+
+    The returned function behaves as [data_tools.match], or as
+    [data_tools.fullmatch] if `full` is `True`, called with the given
+    `patterns`. The patterns are parsed and compiled only once, which is
+    useful to check many paths.
+
+    ```python
+    >>> is_b = compile_patterns(("a", ..., "b"), full=True)
+    >>> [path for path, _ in flatten({"a": [{"b": 1}, {"b": 2}]}) if is_b(path)]
+    [('a', 0, 'b'), ('a', 1, 'b')]
+    >>> starts_with_a = compile_patterns(("a",), ("b",))
+    >>> starts_with_a(("a", 0, "b"))
+    True
+    ```
+
+    The `wildcard_obj`, `autoparse` and `parse_args` arguments have the same
+    meaning as in [data_tools.match], and they also apply to the paths.
+
+    ```python
+    >>> is_b = compile_patterns("a/?/b", full=True, sep_chr="/", wildcard_chr="?")
+    >>> is_b("a/0/b")
+    True
+    ```
+
+    When `full` is `True`, only the patterns with the same length as the path
+    are checked. Large sets of patterns are merged into a trie, so each path
+    is walked once for all of them.
+
+    ```python
+    >>> patterns = [("k", i) for i in range(30)] + [("a", ..., "b")]
+    >>> is_many = compile_patterns(*patterns, full=True)
+    >>> is_many(("k", 7)), is_many(("k", 7, "x")), is_many(("k", 30)), is_many(("a", 0, "b"))
+    (True, False, False, True)
+    >>> starts_with_many = compile_patterns(*patterns)
+    >>> starts_with_many(("k", 7, "x")), starts_with_many(("a", 0)), starts_with_many(("a", 0, "b", "c"))
+    (True, False, True)
+    >>> is_many(("a", [1], "b")), starts_with_many(("k", [1]))
+    (True, False)
+    ```
+    """
+    parse_args = {"wildcard_obj": wildcard_obj, **parse_args}
+    patterns = _prepare_patterns(patterns, wildcard_obj, autoparse, parse_args)
+    matcher = _build_matcher(patterns, full)
+
+    def match_any(path):
+        return matcher(_prepare_path(path, autoparse, parse_args))
+
+    return match_any
 
 
-def _match(path, pattern, full, wildcard_obj, autoparse, **parse_args):
+def _match_any(path, patterns, full, wildcard_obj, autoparse, parse_args):
     parse_args = {"wildcard_obj": wildcard_obj, **parse_args}
-    path = _try_parse(path, autoparse, "path", **parse_args)
-    pattern = _try_parse(pattern, autoparse, "pattern", **parse_args)
-    it = iter(path)
-    for p in pattern:
+    path = _prepare_path(path, autoparse, parse_args)
+    patterns = _prepare_patterns(patterns, wildcard_obj, autoparse, parse_args)
+    key = (patterns, full)
+    try:
+        matcher = _MATCHERS.get(key)
+    except TypeError:
+        # Unhashable patterns can not be cached
+        return _match_patterns(path, patterns, full)
+    if matcher is None:
+        # Only generate code for the patterns that are used more than once
+        if key not in _MATCHERS:
+            if len(_MATCHERS) >= _MATCHERS_SIZE:
+                _MATCHERS.clear()
+            _MATCHERS[key] = None
+            return _match_patterns(path, patterns, full)
+        matcher = _MATCHERS[key] = _build_matcher(patterns, full)
+    return matcher(path)
+
+
+def _prepare_path(path, autoparse, parse_args):
+    if isinstance(path, str):
+        path = _try_parse(path, autoparse, "path", **parse_args)
+    if not isinstance(path, (tuple, list)):
+        path = tuple(path)
+    return path
+
+
+def _prepare_patterns(patterns, wildcard_obj, autoparse, parse_args):
+    # Parse the patterns and replace the wildcards by a private sentinel, so
+    # equal patterns with different wildcard objects do not look the same
+    result = []
+    for pattern in patterns:
+        if isinstance(pattern, str):
+            pattern = _try_parse(pattern, autoparse, "pattern", **parse_args)
+        result.append(tuple(_wildcard if p is wildcard_obj else p for p in pattern))
+    return tuple(result)
+
+
+def _build_matcher(patterns, full):
+    if len(patterns) > _TRIE_THRESHOLD:
         try:
-            curr = next(it)
-        except StopIteration:
-            # Patterns are longer than path
-            return False
-        if p is wildcard_obj:
+            return _trie_matcher(patterns, full)
+        except TypeError:
+            # Unhashable keys can not be trie edges
+            pass
+    return _compile_matcher(patterns, full)
+
+
+def _match_patterns(path, patterns, full):
+    # Interpreted version of the generated matchers
+    n = len(path)
+    for pattern in patterns:
+        if len(pattern) > n or (full and len(pattern) != n):
             continue
-        if p != curr:
-            return False
-    try:
-        next(it)
-        # Path is longer than pattern
-        return not full
-    except StopIteration:
-        # Path is same length as pattern
-        return True
+        for i, p in enumerate(pattern):
+            if p is not _wildcard and p != path[i]:
+                break
+        else:
+            return True
+    return False
+
+
+def _compile_matcher(patterns, full):
+    # Generate a single function checking all the patterns, grouped by length,
+    # with one comparison per non-wildcard key. The keys are bound as globals
+    # of the generated code, so any object is allowed.
+    by_length = {}
+    for j, pattern in enumerate(patterns):
+        by_length.setdefault(len(pattern), []).append((j, pattern))
+    lines = ["def matcher(path):", "    n = len(path)"]
+    env = {}
+    for length, group in by_length.items():
+        lines.append(f"    if n {'==' if full else '>='} {length}:")
+        for j, pattern in group:
+            checks = []
+            for i, p in enumerate(pattern):
+                if p is _wildcard:
+                    continue
+                env[f"p{j}_{i}"] = p
+                checks.append(f"not p{j}_{i} != path[{i}]")
+            lines.append(f"        if {' and '.join(checks) or 'True'}:")
+            lines.append("            return True")
+    lines.append("    return False")
+    exec("\n".join(lines), env)
+    return env["matcher"]
+
+
+def _build_trie(patterns, wildcard_obj):
+    # Each node is a list with the literal edges, the wildcard edge and
+    # whether any pattern ends there
+    root = [{}, None, False]
+    for pattern in patterns:
+        node = root
+        for p in pattern:
+            if p is wildcard_obj:
+                if node[1] is None:
+                    node[1] = [{}, None, False]
+                node = node[1]
+            else:
+                node = node[0].setdefault(p, [{}, None, False])
+        node[2] = True
+    return root
+
+
+def _trie_step(nodes, key):
+    # Advance every active node by key, following literal and wildcard edges
+    # (each node has a single parent, so the result has no duplicates)
+    result = []
+    for edges, wild, _ in nodes:
+        node = edges.get(key)
+        if node is not None:
+            result.append(node)
+        if wild is not None:
+            result.append(wild)
+    return result
+
+
+def _trie_matcher(patterns, full):
+    # Walk the path once for all the patterns at the same time
+    root = _build_trie(patterns, _wildcard)
+
+    def matcher(path):
+        nodes = [root]
+        try:
+            for key in path:
+                if not full:
+                    for node in nodes:
+                        if node[2]:
+                            return True
+                nodes = _trie_step(nodes, key)
+                if not nodes:
+                    return False
+        except TypeError:
+            # Unhashable keys in the path can not be looked up in the trie
+            return _match_patterns(path, patterns, full)
+        for node in nodes:
+            if node[2]:
+                return True
+        return False
+
+    return matcher
 
 
 def _try_parse(path, autoparse, name, **parse_args):
     if isinstance(path, str):
         if autoparse:
-            path = parse(path, **parse_args)
+            if (parse_args.get("wildcard_chr") is not None
+                    and parse_args.get("wildcard_obj", WILDCARD_OBJ) is not WILDCARD_OBJ):
+                # The cache compares the wildcard_obj by equality, but it is
+                # checked by identity, so an equal one could be returned
+                path = parse(path, **parse_args)
+            else:
+                try:
+                    path = _parse_cached(path, **parse_args)
+                except TypeError:
+                    # Unhashable arguments can not be cached
+                    path = parse(path, **parse_args)
         else:
             raise TypeError(f"{name} must be an iterable of keys or indexes")
     return path
 
 
+@lru_cache(maxsize=1024, typed=True)
+def _parse_cached(path, sep_chr=SEP_CHR, quote_chr=None, wildcard_chr=None, wildcard_obj=WILDCARD_OBJ):
+    return parse(path, sep_chr, quote_chr, wildcard_chr, wildcard_obj)
+
+
 def parse(path, sep_chr=SEP_CHR, quote_chr=None, wildcard_chr=None, wildcard_obj=WILDCARD_OBJ):
     """Parse a path string into a sequence of keys and indices.
     The separator is `.` by default, but it can be changed.
@@ -614,28 +1156,24 @@ def parse(path, sep_chr=SEP_CHR, quote_chr=None, wildcard_chr=None, wildcard_obj
         raise ValueError("invalid wildcard. Must be a single character")
 
     quotes = [quote_chr] if quote_chr else ['"', "'"]
+
+    # Fast path: without quotes in the path, splitting is enough
+    if (quote_chr not in path) if quote_chr else ('"' not in path and "'" not in path):
+        result = []
+        for part in path.split(sep_chr):
+            if part:
+                result.append(_convert_part(part, quotes, wildcard_chr, wildcard_obj))
+        return tuple(result)
+
     result = []
     last = -1
     quote = None
-    path += sep_chr
     for i, c in enumerate(path):
         # State 1: Normal character
         if c == sep_chr and not quote:
             part = path[last + 1 : i]
             if part:
-                # Remove quotes
-                if part[0] in quotes and part[0] == part[-1]:
-                    part = part[1:-1]
-                # Replace wildcard
-                elif part == wildcard_chr:
-                    part = wildcard_obj
-                # Or parse as int if possible
-                else:
-                    try:
-                        part = int(part)
-                    except ValueError:
-                        pass
-                result.append(part)
+                result.append(_convert_part(part, quotes, wildcard_chr, wildcard_obj))
             last = i
         # State 2: Opening quote
         elif not quote and c in quotes:
@@ -643,9 +1181,28 @@ def parse(path, sep_chr=SEP_CHR, quote_chr=None, wildcard_chr=None, wildcard_obj
         # State 3: Closing quote
         elif quote == c:
             quote = None
+    # The last part is only closed if its quotes are
+    if not quote:
+        part = path[last + 1 :]
+        if part:
+            result.append(_convert_part(part, quotes, wildcard_chr, wildcard_obj))
     return tuple(result)
 
 
+def _convert_part(part, quotes, wildcard_chr, wildcard_obj):
+    # Remove quotes
+    if part[0] in quotes and part[0] == part[-1]:
+        return intern(part[1:-1])
+    # Replace wildcard
+    if part == wildcard_chr:
+        return wildcard_obj
+    # Or parse as int if possible
+    try:
+        return int(part)
+    except ValueError:
+        return intern(part)
+
+
 if __name__ == "__main__":
     import doctest_utils
     parser = doctest_utils.MarkdownDocTestParser()